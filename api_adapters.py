@@ -1,21 +1,239 @@
 # Contains the adapter classes for communicating with external mapping APIs.
 
+import functools
+import logging
+import re
 import requests
 import os
+import threading
 import time
 from datetime import datetime
 from urllib.parse import quote
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+from api_cache import GeocodingCache
 from api_structures import Coordinates, RouteInfo
 
+log = logging.getLogger(__name__)
+
+# orjson decodes the large TomTom/Google JSON bodies several times faster
+# than the stdlib parser; fall back to stdlib json when it is not installed.
+try:
+    import orjson
+
+    def _parse_json(body: bytes) -> dict | list:
+        """Decodes a JSON response body into native Python objects."""
+        return orjson.loads(body)
+except ImportError:
+    import json
+
+    def _parse_json(body: bytes) -> dict | list:
+        """Decodes a JSON response body into native Python objects."""
+        return json.loads(body)
+
 # --- API Configuration ---
 # Keys are read from environment variables for security.
+
+
+@dataclass(frozen=True, slots=True)
+class _Keys:
+    """Immutable snapshot of the API credentials read from the environment.
+
+    Adapters bind the key they need once in __init__, so the request hot
+    path does a slot load instead of a module-global lookup per call."""
+    tomtom: str
+    google: str
+    geocodeco: str
+
+
 load_dotenv()
-TOMTOM_API_KEY = os.getenv("TOMTOM_API_KEY")
-GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
-GEOCODECO_API_KEY = os.getenv("GEOCODECO_API_KEY")
+_KEYS = _Keys(
+    tomtom=os.getenv("TOMTOM_API_KEY", ""),
+    google=os.getenv("GOOGLE_API_KEY", ""),
+    geocodeco=os.getenv("GEOCODECO_API_KEY", ""))
+
+# (connect, read) timeout in seconds applied to every outgoing request.
+REQUEST_TIMEOUT = (3, 10)
+
+# Shared by all adapters so repeated address lookups skip the network entirely.
+_GEOCODE_CACHE = GeocodingCache()
+
+# Maps a full request URL to the (ETag, body) of its last successful response.
+_ETAG_CACHE: dict[str, tuple[str, bytes]] = {}
+
+
+def _conditional_get(session: requests.Session, url: str, params: dict) -> tuple[requests.Response, bytes]:
+    """
+    Issues a GET with ETag revalidation.
+
+    When a previous response to the identical request carried an ETag, the
+    request is sent with If-None-Match so the server can answer with an
+    empty 304 body; in that case the cached body is returned instead of
+    re-downloading the full payload.
+    """
+    key = f"{url}?{requests.compat.urlencode(sorted(params.items()))}"
+    cached = _ETAG_CACHE.get(key)
+    headers = {'If-None-Match': cached[0]} if cached else None
+    response = session.get(
+        url, params=params, headers=headers, timeout=REQUEST_TIMEOUT)
+    if cached and response.status_code == 304:
+        return response, cached[1]
+    etag = response.headers.get('ETag')
+    # status_code rather than .ok: the latter does not exist on httpx
+    # responses when the COMMUTE_HTTP2 client is active.
+    if etag and response.status_code < 400:
+        _ETAG_CACHE[key] = (etag, response.content)
+    return response, response.content
+
+
+# Matches addresses that are already a plain "lat, lon" pair.
+_LATLON_RE = re.compile(r'^\s*(-?\d+\.?\d*)\s*,\s*(-?\d+\.?\d*)\s*$')
+
+
+def _parse_latlon(address: str) -> Coordinates | None:
+    """Returns Coordinates directly when the address is already a
+    "lat, lon" string, so no geocoding round trip is needed."""
+    m = _LATLON_RE.match(address)
+    if m:
+        return Coordinates(lat=float(m.group(1)), lon=float(m.group(2)))
+    return None
+
+
+def _check_status(response: requests.Response) -> None:
+    """
+    Raises HTTPError for any 4xx/5xx response.
+
+    A slimmer replacement for raise_for_status(), which decodes the reason
+    phrase and builds its message even on the happy path. Parsing bodies
+    with _parse_json(response.content) likewise avoids requests' charset
+    detection: these APIs always answer UTF-8 JSON.
+    """
+    if response.status_code >= 400:
+        raise requests.exceptions.HTTPError(
+            f"HTTP {response.status_code} for url: {response.url}",
+            response=response)
+
+
+@functools.lru_cache(maxsize=4096)
+def _quote_address(address: str) -> str:
+    """URL-encodes an address for use as a path segment, memoized because
+    quote() is pure Python and the same address is often looked up again."""
+    return quote(address, safe='')
+
+
+@functools.lru_cache(maxsize=256)
+def _coord_str(coords: Coordinates) -> str:
+    """Formats coordinates as "lat,lon", cached per distinct value.
+
+    Coordinates is frozen and hashable, so a sweep of many departure times
+    for the same origin/destination reuses one string instead of redoing
+    the float formatting on every call."""
+    return f"{coords.lat},{coords.lon}"
+
+
+class _TokenBucket:
+    """
+    A minimal token-bucket rate limiter.
+
+    Unlike a fixed sleep after every request, acquire() only waits for the
+    part of the rate interval that has not already elapsed since the last
+    request, so time spent waiting on the network "pays down" the limit.
+    """
+
+    def __init__(self, rate: float, max_tokens: float = 1.0):
+        self.rate = rate  # Tokens replenished per second.
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+        self.updated_at = time.monotonic()
+        # Concurrent sweeps call acquire() from worker threads.
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Blocks until a token is available, then consumes it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.max_tokens,
+                    self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class _Http2Session:
+    """
+    Wraps an httpx HTTP/2 client in the sliver of the requests.Session
+    interface the adapters use.
+
+    HTTP/2 multiplexes all in-flight requests of a concurrent sweep over
+    one connection (one TLS handshake total). Transport errors are
+    translated to requests' exception type so the adapters' error handling
+    stays uniform regardless of which client is active.
+    """
+
+    def __init__(self, client):
+        self._client = client
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        # Timeouts are configured on the client itself; the argument is
+        # accepted only for call-site compatibility.
+        try:
+            return self._client.get(url, params=params, headers=headers)
+        except Exception as e:
+            raise requests.exceptions.ConnectionError(str(e)) from e
+
+
+def _build_session():
+    """Creates the shared HTTP client for all adapters.
+
+    By default this is a requests.Session with a pooled HTTPS adapter, so
+    the TCP/TLS connection is reused across consecutive calls to the same
+    host, and transient upstream errors (429/502/503/504) are retried up
+    to three times with exponential backoff (Retry-After is honored for
+    429), keeping tail latency bounded when one of the APIs is flaky.
+
+    Setting COMMUTE_HTTP2=1 (with the optional httpx package installed)
+    swaps in an HTTP/2 client instead; both Google and TomTom speak HTTP/2
+    at their API endpoints."""
+    if os.getenv("COMMUTE_HTTP2") == "1":
+        try:
+            import httpx
+            # Constructing the client can itself raise ImportError when
+            # httpx is installed without its 'h2' extra.
+            client = httpx.Client(
+                http2=True,
+                limits=httpx.Limits(max_connections=8,
+                                    max_keepalive_connections=8),
+                timeout=httpx.Timeout(
+                    REQUEST_TIMEOUT[1], connect=REQUEST_TIMEOUT[0]))
+        except ImportError as e:
+            log.warning(
+                "COMMUTE_HTTP2 is set but the HTTP/2 stack is unavailable (%s); using requests.", e)
+        else:
+            return _Http2Session(client)
+
+    session = requests.Session()
+    retries = Retry(total=3, backoff_factor=0.3,
+                    status_forcelist=(429, 502, 503, 504),
+                    allowed_methods=frozenset(['GET']))
+    session.mount("https://", HTTPAdapter(
+        pool_connections=4, pool_maxsize=64, max_retries=retries))
+    return session
+
+
+# One shared session for the whole module: adapters are often instantiated
+# several times (directly and inside FallbackGeocoderAdapter), and a single
+# pool lets them all reuse the same warm connections per host.
+_SESSION = _build_session()
 
 
 class ApiAdapter(ABC):
@@ -33,6 +251,26 @@ class ApiAdapter(ABC):
         """Calculates a route and returns our standard RouteInfo object."""
         pass
 
+    # Cap on how many route requests we fire at one host at the same time.
+    MAX_CONCURRENT_ROUTES = 10
+
+    def get_routes(self, start_coords: Coordinates, end_coords: Coordinates, departure_times: list[datetime]) -> list[RouteInfo | None]:
+        """
+        Calculates routes for several departure times concurrently.
+
+        Each call is pure I/O waiting on the remote API, so fanning the
+        requests out over a small thread pool turns N serial round trips
+        into roughly one (bounded by the slowest response). Results are
+        returned in the same order as `departure_times`.
+        """
+        if not departure_times:
+            return []
+        workers = min(self.MAX_CONCURRENT_ROUTES, len(departure_times))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(
+                lambda t: self.get_route(start_coords, end_coords, t),
+                departure_times))
+
 
 class GeocodeCoAdapter(ApiAdapter):
     """The adapter for the geocode.maps.co API (geocoding only)."""
@@ -40,43 +278,71 @@ class GeocodeCoAdapter(ApiAdapter):
 
     def __init__(self, verbose: bool = False):
         self.verbose = verbose
-        if not GEOCODECO_API_KEY:
+        self._session = _SESSION
+        # This free API has a rate limit of 1 request/second.
+        self._bucket = _TokenBucket(rate=1.0)
+        self._key = _KEYS.geocodeco
+        if not self._key:
             raise ValueError(
                 "FATAL ERROR: The GEOCODECO_API_KEY environment variable is not set.")
 
     def get_coordinates(self, address: str) -> Coordinates | None:
-        print(f"   > [Geocode.co] Geocoding address: '{address}'...")
-        params = {'q': address, 'api_key': GEOCODECO_API_KEY}
+        if (coords := _parse_latlon(address)):
+            return coords
 
-        if self.verbose:
-            full_url = f"{self.GEOCODE_URL}?{requests.compat.urlencode(params)}"
-            print(f"   > [API-TRACE] Request URL: {full_url}")
+        cache_key = GeocodingCache.make_key("geocodeco", address)
+        cached = _GEOCODE_CACHE.get(cache_key)
+        if cached:
+            return cached
+
+        log.debug("[Geocode.co] Geocoding address: %s", address)
+        params = {'q': address, 'api_key': self._key}
+
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("[API-TRACE] Request URL: %s?%s",
+                      self.GEOCODE_URL, requests.compat.urlencode(params))
 
         try:
-            response = requests.get(self.GEOCODE_URL, params=params)
-            # This free API has a rate limit of 1 request/second.
-            time.sleep(1.1)  # Pause to respect rate limit
+            self._bucket.acquire()
+            response, body = _conditional_get(
+                self._session, self.GEOCODE_URL, params)
 
             if response.status_code == 429:
-                print("   > Error: Exceeded API rate limit for geocode.maps.co.")
-                return None
-
-            response.raise_for_status()
-            data = response.json()
+                # Honor the server's Retry-After hint and try once more.
+                try:
+                    retry_after = float(response.headers.get('Retry-After', 1))
+                except ValueError:
+                    retry_after = 1.0
+                log.warning(
+                    "Hit the Geocode.co rate limit. Retrying after %.1fs.", retry_after)
+                time.sleep(retry_after)
+                response, body = _conditional_get(
+                    self._session, self.GEOCODE_URL, params)
+                if response.status_code == 429:
+                    log.warning(
+                        "Exceeded API rate limit for geocode.maps.co.")
+                    return None
+
+            _check_status(response)
+            data = _parse_json(body)
 
             if data:
                 # *** NORMALIZATION to our standard Coordinates object ***
                 location = data[0]
-                return Coordinates(lat=float(location['lat']), lon=float(location['lon']))
+                coords = Coordinates(
+                    lat=float(location['lat']), lon=float(location['lon']))
+                _GEOCODE_CACHE.set(cache_key, coords)
+                return coords
             else:
-                print(
-                    f"   > Error: Could not find coordinates for address: {address}")
+                log.warning(
+                    "Could not find coordinates for address: %s", address)
                 return None
         except requests.exceptions.RequestException as e:
-            print(f"   > Error connecting to Geocode.co API: {e}")
+            log.warning("Error connecting to Geocode.co API: %s", e)
             return None
         except (KeyError, IndexError):
-            print(f"   > Error parsing Geocode.co API response for: {address}")
+            log.warning(
+                "Error parsing Geocode.co API response for: %s", address)
             return None
 
     def get_route(self, start_coords: Coordinates, end_coords: Coordinates, departure_time: datetime) -> RouteInfo | None:
@@ -91,31 +357,57 @@ class FallbackGeocoderAdapter(ApiAdapter):
     to another adapter for routing and failed geocoding lookups.
     """
 
+    # After this many consecutive primary failures, the circuit breaker
+    # opens and the primary is skipped for BREAKER_SKIP_CALLS lookups.
+    FAIL_STREAK_LIMIT = 3
+    BREAKER_SKIP_CALLS = 5
+
     def __init__(self, primary_geocoder: ApiAdapter, fallback_adapter: ApiAdapter, verbose: bool = False):
         self.primary_geocoder = primary_geocoder
         self.fallback_adapter = fallback_adapter
         self.verbose = verbose
+        # Resolve the display names once instead of reflecting on every call.
+        self._primary_name = type(primary_geocoder).__name__
+        self._fallback_name = type(fallback_adapter).__name__
+        self._primary_fail_streak = 0
+        self._primary_skips_left = 0
 
     def get_coordinates(self, address: str) -> Coordinates | None:
-        if self.verbose:
-            print(
-                f"\nAttempting geocoding with primary: {type(self.primary_geocoder).__name__}")
+        if (coords := _parse_latlon(address)):
+            return coords
 
+        if self._primary_skips_left > 0:
+            # A repeatedly failing primary would cost a guaranteed-lost
+            # network round trip; go straight to the fallback for a while.
+            self._primary_skips_left -= 1
+            log.debug("Circuit breaker open; skipping primary geocoder %s.",
+                      self._primary_name)
+            return self.fallback_adapter.get_coordinates(address)
+
+        log.debug("Attempting geocoding with primary: %s", self._primary_name)
         coords = self.primary_geocoder.get_coordinates(address)
         if coords:
+            self._primary_fail_streak = 0
             return coords
 
-        print(
-            f"\n   ! Primary geocoder failed. Falling back to {type(self.fallback_adapter).__name__}.")
+        self._primary_fail_streak += 1
+        if self._primary_fail_streak >= self.FAIL_STREAK_LIMIT:
+            self._primary_fail_streak = 0
+            self._primary_skips_left = self.BREAKER_SKIP_CALLS
+
+        log.warning("Primary geocoder failed. Falling back to %s.",
+                    self._fallback_name)
         return self.fallback_adapter.get_coordinates(address)
 
     def get_route(self, start_coords: Coordinates, end_coords: Coordinates, departure_time: datetime) -> RouteInfo | None:
         # Routing is always delegated to the fallback adapter.
-        if self.verbose:
-            print(
-                f"\nRouting calculation handled by: {type(self.fallback_adapter).__name__}")
+        log.debug("Routing calculation handled by: %s", self._fallback_name)
         return self.fallback_adapter.get_route(start_coords, end_coords, departure_time)
 
+    def get_routes(self, start_coords: Coordinates, end_coords: Coordinates, departure_times: list[datetime]) -> list[RouteInfo | None]:
+        # Delegate the whole batch so the fallback's own concurrency applies.
+        return self.fallback_adapter.get_routes(start_coords, end_coords, departure_times)
+
 
 class TomTomAdapter(ApiAdapter):
     """The adapter for the TomTom API."""
@@ -124,70 +416,91 @@ class TomTomAdapter(ApiAdapter):
 
     def __init__(self, verbose: bool = False):
         self.verbose = verbose
-        if not TOMTOM_API_KEY:
+        self._session = _SESSION
+        self._route_query_cache: dict[tuple[Coordinates, Coordinates], tuple[str, dict]] = {}
+        # TomTom's published limit for the routing API is 5 requests/second.
+        self._bucket = _TokenBucket(rate=5.0, max_tokens=5)
+        self._key = _KEYS.tomtom
+        if not self._key:
             raise ValueError(
                 "FATAL ERROR: The TOMTOM_API_KEY environment variable is not set.")
 
     def get_coordinates(self, address: str) -> Coordinates | None:
-        print(f"   > [TomTom] Geocoding address: '{address}'...")
-        encoded_address = quote(address)
-        url = self.GEOCODE_URL.format(address=encoded_address)
-        params = {'key': TOMTOM_API_KEY}
+        if (coords := _parse_latlon(address)):
+            return coords
+
+        cache_key = GeocodingCache.make_key("tomtom", address)
+        cached = _GEOCODE_CACHE.get(cache_key)
+        if cached:
+            return cached
 
-        if self.verbose:
-            full_url = f"{url}?{requests.compat.urlencode(params)}"
-            print(f"   > [API-TRACE] Request URL: {full_url}")
+        log.debug("[TomTom] Geocoding address: %s", address)
+        url = self.GEOCODE_URL.format(address=_quote_address(address))
+        params = {'key': self._key}
+
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("[API-TRACE] Request URL: %s?%s",
+                      url, requests.compat.urlencode(params))
 
         try:
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
+            response, body = _conditional_get(self._session, url, params)
+            _check_status(response)
+            data = _parse_json(body)
             if data and data.get('results'):
                 position = data['results'][0]['position']
                 # *** NORMALIZATION to our standard Coordinates object ***
-                return Coordinates(lat=position['lat'], lon=position['lon'])
+                coords = Coordinates(lat=position['lat'], lon=position['lon'])
+                _GEOCODE_CACHE.set(cache_key, coords)
+                return coords
             else:
-                print(
-                    f"   > Error: Could not find coordinates for address: {address}")
+                log.warning(
+                    "Could not find coordinates for address: %s", address)
                 return None
         except requests.exceptions.RequestException as e:
-            print(f"   > Error connecting to TomTom Geocoding API: {e}")
+            log.warning("Error connecting to TomTom Geocoding API: %s", e)
             return None
         except (KeyError, IndexError):
-            print(
-                f"   > Error parsing TomTom Geocoding API response for: {address}")
+            log.warning(
+                "Error parsing TomTom Geocoding API response for: %s", address)
             return None
 
+    def _prepare_route_query(self, start_coords: Coordinates, end_coords: Coordinates) -> tuple[str, dict]:
+        """Builds (and memoizes) the URL and invariant params for a route
+        query, so a sweep over many departure times only varies departAt."""
+        key = (start_coords, end_coords)
+        prepared = self._route_query_cache.get(key)
+        if prepared is None:
+            locations = f"{_coord_str(start_coords)}:{_coord_str(end_coords)}"
+            prepared = (self.ROUTING_URL.format(locations=locations),
+                        {'key': self._key, 'traffic': 'true'})
+            self._route_query_cache[key] = prepared
+        return prepared
+
     def get_route(self, start_coords: Coordinates, end_coords: Coordinates, departure_time: datetime) -> RouteInfo | None:
-        locations = f"{start_coords.lat},{start_coords.lon}:{end_coords.lat},{end_coords.lon}"
-        url = self.ROUTING_URL.format(locations=locations)
-        params = {
-            'key': TOMTOM_API_KEY,
-            'departAt': departure_time.isoformat(),
-            'traffic': 'true'
-        }
+        url, base_params = self._prepare_route_query(start_coords, end_coords)
+        params = dict(base_params)
+        params['departAt'] = departure_time.isoformat()
+        self._bucket.acquire()
 
-        if self.verbose:
-            full_url = f"{url}?{requests.compat.urlencode(params)}"
-            print(f"   > [API-TRACE] Request URL: {full_url}")
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("[API-TRACE] Request URL: %s?%s",
+                      url, requests.compat.urlencode(params))
 
         try:
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
+            response, body = _conditional_get(self._session, url, params)
+            _check_status(response)
+            data = _parse_json(body)
             # *** NORMALIZATION to our standard RouteInfo object ***
             travel_seconds = data['routes'][0]['summary']['travelTimeInSeconds']
             # When 'traffic' is set to 'true', TomTom's travelTimeInSeconds includes traffic delay.
             return RouteInfo(travel_time_sec=travel_seconds, traffic_data_included=True)
         except requests.exceptions.RequestException as e:
-            departure_str = departure_time.strftime('%I:%M %p')
-            print(
-                f"   > [TomTom] A network error occurred for route calculation at {departure_str}: {e}")
+            log.warning("[TomTom] A network error occurred for route calculation at %s: %s",
+                        departure_time.strftime('%I:%M %p'), e)
             return None
         except (KeyError, IndexError):
-            departure_str = departure_time.strftime('%I:%M %p')
-            print(
-                f"   > [TomTom] Could not find a valid route for the departure time: {departure_str}.")
+            log.warning("[TomTom] Could not find a valid route for the departure time: %s.",
+                        departure_time.strftime('%I:%M %p'))
             return None
 
 
@@ -195,66 +508,101 @@ class GoogleMapsAdapter(ApiAdapter):
     """The adapter for the Google Maps API."""
     GEOCODING_URL = "https://maps.googleapis.com/maps/api/geocode/json"
     DIRECTIONS_URL = "https://maps.googleapis.com/maps/api/directions/json"
+    DISTANCE_MATRIX_URL = "https://maps.googleapis.com/maps/api/distancematrix/json"
 
     def __init__(self, verbose: bool = False):
         self.verbose = verbose
-        if not GOOGLE_API_KEY:
+        self._session = _SESSION
+        self._route_query_cache: dict[tuple[Coordinates, Coordinates], tuple[str, dict]] = {}
+        # Google allows far higher QPS; this just guards against bursts.
+        self._bucket = _TokenBucket(rate=50.0, max_tokens=50)
+        self._key = _KEYS.google
+        if not self._key:
             raise ValueError(
                 "FATAL ERROR: The GOOGLE_API_KEY environment variable is not set.")
 
     def get_coordinates(self, address: str) -> Coordinates | None:
-        print(f"   > [Google] Geocoding address: '{address}'...")
+        if (coords := _parse_latlon(address)):
+            return coords
+
+        cache_key = GeocodingCache.make_key("google", address)
+        cached = _GEOCODE_CACHE.get(cache_key)
+        if cached:
+            return cached
+
+        log.debug("[Google] Geocoding address: %s", address)
         params = {
             'address': address,
-            'key': GOOGLE_API_KEY
+            'key': self._key
         }
 
-        if self.verbose:
-            full_url = f"{self.GEOCODING_URL}?{requests.compat.urlencode(params)}"
-            print(f"   > [API-TRACE] Request URL: {full_url}")
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("[API-TRACE] Request URL: %s?%s",
+                      self.GEOCODING_URL, requests.compat.urlencode(params))
 
         try:
-            response = requests.get(self.GEOCODING_URL, params=params)
-            response.raise_for_status()
-            data = response.json()
+            response, body = _conditional_get(
+                self._session, self.GEOCODING_URL, params)
+            _check_status(response)
+            data = _parse_json(body)
             if data.get('status') == 'OK' and data.get('results'):
                 location = data['results'][0]['geometry']['location']
                 # *** NORMALIZATION to our standard Coordinates object ***
-                return Coordinates(lat=location['lat'], lon=location['lng'])
+                coords = Coordinates(lat=location['lat'], lon=location['lng'])
+                _GEOCODE_CACHE.set(cache_key, coords)
+                return coords
             else:
-                print(
-                    f"   > Error: Could not find coordinates for address: {address}. Status: {data.get('status')}")
+                log.warning("Could not find coordinates for address: %s. Status: %s",
+                            address, data.get('status'))
                 return None
         except requests.exceptions.RequestException as e:
-            print(f"   > Error connecting to Google Geocoding API: {e}")
+            log.warning("Error connecting to Google Geocoding API: %s", e)
             return None
         except (KeyError, IndexError):
-            print(
-                f"   > Error parsing Google Geocoding API response for: {address}")
+            log.warning(
+                "Error parsing Google Geocoding API response for: %s", address)
             return None
 
-    def get_route(self, start_coords: Coordinates, end_coords: Coordinates, departure_time: datetime) -> RouteInfo | None:
-        origin = f"{start_coords.lat},{start_coords.lon}"
-        destination = f"{end_coords.lat},{end_coords.lon}"
-
-        # Google's Directions API requires departure_time as a Unix timestamp.
-        departure_timestamp = int(departure_time.timestamp())
-
-        params = {
-            'origin': origin,
-            'destination': destination,
-            'departure_time': departure_timestamp,
-            'key': GOOGLE_API_KEY
-        }
-
-        if self.verbose:
-            full_url = f"{self.DIRECTIONS_URL}?{requests.compat.urlencode(params)}"
-            print(f"   > [API-TRACE] Request URL: {full_url}")
+    @staticmethod
+    def timestamps_for(times: list[datetime]) -> list[int]:
+        """Converts a batch of departure datetimes to Unix timestamps in
+        one pass, so bulk drivers pay the tzinfo walk once per sweep
+        instead of inside every request."""
+        return [int(t.timestamp()) for t in times]
+
+    def _prepare_route_query(self, start_coords: Coordinates, end_coords: Coordinates) -> tuple[str, dict]:
+        """Builds (and memoizes) the URL and invariant params for a route
+        query, so a sweep over many departure times only varies the
+        departure_time parameter."""
+        key = (start_coords, end_coords)
+        prepared = self._route_query_cache.get(key)
+        if prepared is None:
+            prepared = (self.DIRECTIONS_URL,
+                        {'origin': _coord_str(start_coords),
+                         'destination': _coord_str(end_coords),
+                         'key': self._key})
+            self._route_query_cache[key] = prepared
+        return prepared
+
+    def get_route(self, start_coords: Coordinates, end_coords: Coordinates, departure_time: datetime,
+                  departure_timestamp: int | None = None) -> RouteInfo | None:
+        url, base_params = self._prepare_route_query(start_coords, end_coords)
+        params = dict(base_params)
+        # Google's Directions API requires departure_time as a Unix timestamp;
+        # bulk callers can pass one precomputed via timestamps_for().
+        if departure_timestamp is None:
+            departure_timestamp = int(departure_time.timestamp())
+        params['departure_time'] = departure_timestamp
+        self._bucket.acquire()
+
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("[API-TRACE] Request URL: %s?%s",
+                      url, requests.compat.urlencode(params))
 
         try:
-            response = requests.get(self.DIRECTIONS_URL, params=params)
-            response.raise_for_status()
-            data = response.json()
+            response, body = _conditional_get(self._session, url, params)
+            _check_status(response)
+            data = _parse_json(body)
             if data.get('status') == 'OK' and data.get('routes'):
                 leg = data['routes'][0]['legs'][0]
                 traffic_used = False
@@ -268,17 +616,80 @@ class GoogleMapsAdapter(ApiAdapter):
                 # *** NORMALIZATION to our standard RouteInfo object ***
                 return RouteInfo(travel_time_sec=travel_seconds, traffic_data_included=traffic_used)
             else:
-                departure_str = departure_time.strftime('%I:%M %p')
-                print(
-                    f"   > [Google] Could not find a valid route for {departure_str}. Status: {data.get('status')}")
+                log.warning("[Google] Could not find a valid route for %s. Status: %s",
+                            departure_time.strftime('%I:%M %p'), data.get('status'))
                 return None
         except requests.exceptions.RequestException as e:
-            departure_str = departure_time.strftime('%I:%M %p')
-            print(
-                f"   > [Google] A network error occurred for route calculation at {departure_str}: {e}")
+            log.warning("[Google] A network error occurred for route calculation at %s: %s",
+                        departure_time.strftime('%I:%M %p'), e)
             return None
         except (KeyError, IndexError):
-            departure_str = departure_time.strftime('%I:%M %p')
-            print(
-                f"   > [Google] Could not find a valid route for the departure time: {departure_str}.")
+            log.warning("[Google] Could not find a valid route for the departure time: %s.",
+                        departure_time.strftime('%I:%M %p'))
             return None
+
+    def _get_matrix_route(self, start_coords: Coordinates, end_coords: Coordinates, departure_time: datetime,
+                          departure_timestamp: int | None = None) -> RouteInfo | None:
+        """Fetches one traffic-aware duration via the Distance Matrix API,
+        whose responses are far smaller than full Directions results."""
+        if departure_timestamp is None:
+            departure_timestamp = int(departure_time.timestamp())
+        params = {
+            'origins': _coord_str(start_coords),
+            'destinations': _coord_str(end_coords),
+            'departure_time': departure_timestamp,
+            'key': self._key
+        }
+        self._bucket.acquire()
+
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("[API-TRACE] Request URL: %s?%s",
+                      self.DISTANCE_MATRIX_URL, requests.compat.urlencode(params))
+
+        try:
+            response, body = _conditional_get(
+                self._session, self.DISTANCE_MATRIX_URL, params)
+            _check_status(response)
+            data = _parse_json(body)
+            element = data['rows'][0]['elements'][0]
+            if data.get('status') == 'OK' and element.get('status') == 'OK':
+                # *** NORMALIZATION to our standard RouteInfo object ***
+                if 'duration_in_traffic' in element:
+                    return RouteInfo(travel_time_sec=element['duration_in_traffic']['value'],
+                                     traffic_data_included=True)
+                return RouteInfo(travel_time_sec=element['duration']['value'],
+                                 traffic_data_included=False)
+            log.warning("[Google] Distance Matrix returned no route for %s. Status: %s",
+                        departure_time.strftime('%I:%M %p'), element.get('status'))
+            return None
+        except requests.exceptions.RequestException as e:
+            log.warning("[Google] A network error occurred for route calculation at %s: %s",
+                        departure_time.strftime('%I:%M %p'), e)
+            return None
+        except (KeyError, IndexError):
+            log.warning("[Google] Could not parse the Distance Matrix response for: %s.",
+                        departure_time.strftime('%I:%M %p'))
+            return None
+
+    def get_routes_bulk(self, start_coords: Coordinates, end_coords: Coordinates, departure_times: list[datetime]) -> list[RouteInfo | None]:
+        """
+        Sweeps many departure times for one origin/destination pair.
+
+        Uses the lightweight Distance Matrix endpoint instead of Directions
+        and fans the calls out over the pooled session, so a sweep costs a
+        fraction of N serial Directions round trips.
+        """
+        if not departure_times:
+            return []
+        timestamps = self.timestamps_for(departure_times)
+        workers = min(self.MAX_CONCURRENT_ROUTES, len(departure_times))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(
+                lambda pair: self._get_matrix_route(
+                    start_coords, end_coords, pair[0], departure_timestamp=pair[1]),
+                zip(departure_times, timestamps)))
+
+    def get_routes(self, start_coords: Coordinates, end_coords: Coordinates, departure_times: list[datetime]) -> list[RouteInfo | None]:
+        # Batch sweeps go through the lighter Distance Matrix endpoint
+        # rather than N full Directions responses.
+        return self.get_routes_bulk(start_coords, end_coords, departure_times)
@@ -0,0 +1,105 @@
+# Provides persistent caches so repeated API lookups can skip the network.
+
+import dbm
+import os
+import shelve
+import string
+import threading
+import time
+
+from api_structures import Coordinates
+
+CACHE_DIR = os.path.expanduser("~/.cache/shortest_comute")
+GEOCODE_CACHE_PATH = os.path.join(CACHE_DIR, "geocode.db")
+
+# Geocoding a fixed address is deterministic, so entries can live a long time.
+GEOCODE_TTL_SECONDS = 30 * 24 * 60 * 60  # 30 days
+
+# Everything shelve can raise for a disk problem: dbm.error is itself a
+# tuple of exception classes, so it is flattened in; AttributeError covers
+# dbm's lazy submodule initialization failing.
+_DISK_ERRORS = (OSError, *dbm.error, AttributeError)
+
+# Departure times are bucketed to the analysis increment, so adjacent runs
+# that sweep the same window hit the same entries.
+ROUTE_BUCKET_MINUTES = 30
+
+# Strips punctuation so "2600 Alton Pkwy." and "2600 Alton Pkwy" share a key.
+_PUNCT_TBL = str.maketrans('', '', string.punctuation)
+
+# Three decimal places is roughly 100 m - close enough for route planning
+# that nearby points can share a coordinate-keyed cache entry.
+COORD_KEY_PRECISION = 3
+
+
+def round_coords(coords: Coordinates) -> tuple[float, float]:
+    """Rounds coordinates to ~100 m precision for use as cache keys, so
+    queries resolving to effectively the same point hit the same entry."""
+    return (round(coords.lat, COORD_KEY_PRECISION),
+            round(coords.lon, COORD_KEY_PRECISION))
+
+
+class _ShelfCache:
+    """
+    A two-level cache (in-memory dict backed by an on-disk shelve file).
+
+    Entries are stored as (timestamp, value) tuples and expire after
+    `ttl_seconds`. Disk problems are never fatal: if the shelve file cannot
+    be opened the cache silently degrades to memory-only behaviour.
+    """
+
+    def __init__(self, path: str, ttl_seconds: int):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._memory: dict[str, tuple[float, object]] = {}
+        # Serializes all shelve access: callers hit the cache from worker
+        # threads, and neither dbm's lazy submodule initialization nor the
+        # dumbdbm index rewrite on close is safe to run concurrently.
+        self._disk_lock = threading.Lock()
+
+    def _is_fresh(self, entry: tuple[float, object]) -> bool:
+        timestamp, _ = entry
+        return (time.time() - timestamp) < self.ttl_seconds
+
+    def get(self, key: str):
+        """Returns the cached value for `key`, or None on a miss."""
+        entry = self._memory.get(key)
+        if entry and self._is_fresh(entry):
+            return entry[1]
+
+        try:
+            with self._disk_lock, shelve.open(self.path) as db:
+                entry = db.get(key)
+        except _DISK_ERRORS:
+            return None
+
+        if entry and self._is_fresh(entry):
+            self._memory[key] = entry
+            return entry[1]
+        return None
+
+    def set(self, key: str, value) -> None:
+        """Stores `value` under `key` in both cache levels."""
+        entry = (time.time(), value)
+        self._memory[key] = entry
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with self._disk_lock, shelve.open(self.path) as db:
+                db[key] = entry
+        except _DISK_ERRORS:
+            pass  # The in-memory layer still has the entry.
+
+
+class GeocodingCache(_ShelfCache):
+    """Caches address -> Coordinates lookups."""
+
+    def __init__(self, path: str = GEOCODE_CACHE_PATH, ttl_seconds: int = GEOCODE_TTL_SECONDS):
+        super().__init__(path, ttl_seconds)
+
+    @staticmethod
+    def make_key(adapter_name: str, address: str) -> str:
+        """Builds a stable cache key from the adapter name and a normalized
+        address (lowercased, punctuation stripped, whitespace collapsed),
+        so trivially different spellings of one address share an entry."""
+        normalized = ' '.join(address.lower().translate(_PUNCT_TBL).split())
+        return f"{adapter_name}:{normalized}"
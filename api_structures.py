@@ -1,17 +1,34 @@
 # Defines the standardized, internal data structures for the application.
 
 from dataclasses import dataclass
+from datetime import datetime
 
 
-@dataclass
+# slots=True keeps instances compact (no per-instance __dict__), which adds
+# up when a sweep allocates one of these per departure time. frozen=True
+# makes them hashable so they can serve as cache keys.
+@dataclass(slots=True, frozen=True)
 class Coordinates:
     """A standardized representation of geographic coordinates."""
     lat: float
     lon: float
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RouteInfo:
     """A standardized representation of a route's travel time."""
     travel_time_sec: int
     traffic_data_included: bool
+
+
+@dataclass(slots=True, frozen=True)
+class Scenario:
+    """One simulated commute: a departure slot and its round-trip costs."""
+    leave_home: datetime
+    morning_travel_sec: int
+    morning_traffic_ok: bool
+    arrive_work: datetime
+    leave_work: datetime
+    evening_travel_sec: int
+    evening_traffic_ok: bool
+    total_commute_sec: int
@@ -0,0 +1,109 @@
+# Persistent SQLite store of observed route times, shared across analyses.
+
+import logging
+import os
+import sqlite3
+from datetime import datetime
+from time import time
+
+from api_cache import CACHE_DIR, ROUTE_BUCKET_MINUTES, round_coords
+from api_structures import Coordinates, RouteInfo
+
+log = logging.getLogger(__name__)
+
+DB_PATH = os.path.join(CACHE_DIR, "commute_cache.sqlite")
+
+# Commute patterns repeat week to week, so historical observations stay
+# useful considerably longer than a single day.
+ROUTE_TTL_SECONDS = 7 * 24 * 60 * 60  # 7 days
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS routes (
+    o_lat REAL NOT NULL,
+    o_lng REAL NOT NULL,
+    d_lat REAL NOT NULL,
+    d_lng REAL NOT NULL,
+    dep_bucket INTEGER NOT NULL,
+    travel_sec INTEGER NOT NULL,
+    traffic_ok BOOL NOT NULL,
+    ts INTEGER NOT NULL,
+    PRIMARY KEY (o_lat, o_lng, d_lat, d_lng, dep_bucket)
+)
+"""
+
+
+def dep_bucket(departure_time: datetime) -> int:
+    """Maps a departure time to its integer bucket: epoch seconds floored
+    to ROUTE_BUCKET_MINUTES, so adjacent analyses of the same slot share
+    a row."""
+    bucket_seconds = ROUTE_BUCKET_MINUTES * 60
+    return int(departure_time.timestamp()) // bucket_seconds * bucket_seconds
+
+
+class CommuteCache:
+    """
+    Caches (origin, destination, departure bucket) -> RouteInfo in SQLite.
+
+    Unlike a per-key lookup, a whole analysis window is prefetched with
+    one SELECT before the route waves are issued, and every fresh result
+    is written back with one INSERT OR REPLACE batch afterwards. Disk
+    problems are never fatal: if the database cannot be opened the cache
+    degrades to answering every lookup as a miss.
+    """
+
+    def __init__(self, path: str = DB_PATH, ttl_seconds: int = ROUTE_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._conn = sqlite3.connect(path)
+            self._conn.execute(_SCHEMA)
+            self._conn.commit()
+        except (OSError, sqlite3.Error) as e:
+            log.warning("Route cache unavailable (%s); continuing without it.", e)
+            self._conn = None
+
+    def prefetch(self, start_coords: Coordinates, end_coords: Coordinates,
+                 departure_times: list) -> dict[int, RouteInfo]:
+        """Loads every fresh historical row for this origin/destination
+        pair and the given departure slots, keyed by departure bucket."""
+        if self._conn is None or not departure_times:
+            return {}
+
+        buckets = sorted({dep_bucket(t) for t in departure_times})
+        o_lat, o_lng = round_coords(start_coords)
+        d_lat, d_lng = round_coords(end_coords)
+        placeholders = ','.join('?' * len(buckets))
+        try:
+            rows = self._conn.execute(
+                f"SELECT dep_bucket, travel_sec, traffic_ok FROM routes "
+                f"WHERE o_lat = ? AND o_lng = ? AND d_lat = ? AND d_lng = ? "
+                f"AND dep_bucket IN ({placeholders}) AND ts > ?",
+                (o_lat, o_lng, d_lat, d_lng, *buckets,
+                 int(time()) - self.ttl_seconds)).fetchall()
+        except sqlite3.Error as e:
+            log.warning("Route cache read failed (%s).", e)
+            return {}
+
+        return {bucket: RouteInfo(travel_time_sec=travel_sec,
+                                  traffic_data_included=bool(traffic_ok))
+                for bucket, travel_sec, traffic_ok in rows}
+
+    def store(self, start_coords: Coordinates, end_coords: Coordinates,
+              results: list) -> None:
+        """Writes a batch of (departure_time, RouteInfo) observations."""
+        if self._conn is None or not results:
+            return
+
+        o_lat, o_lng = round_coords(start_coords)
+        d_lat, d_lng = round_coords(end_coords)
+        now = int(time())
+        try:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO routes VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(o_lat, o_lng, d_lat, d_lng, dep_bucket(departure_time),
+                  route_info.travel_time_sec,
+                  route_info.traffic_data_included, now)
+                 for departure_time, route_info in results])
+            self._conn.commit()
+        except sqlite3.Error as e:
+            log.warning("Route cache write failed (%s).", e)
@@ -1,26 +1,32 @@
 # Main script to analyze and optimize daily commute times.
 
-import time
+import json
+import logging
 import os
+import sys
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, date
 from zoneinfo import ZoneInfo
 from dotenv import load_dotenv
 from api_adapters import *
+from api_structures import Coordinates, Scenario
+from commute_cache import CommuteCache, dep_bucket
+
+# Keeps observed route times across runs so repeat analyses of the same
+# commute only pay for the departure slots that are not already known.
+COMMUTE_CACHE = CommuteCache()
+
+
+# Days until the next weekday, indexed by weekday(): Friday jumps to
+# Monday (3), Saturday to Monday (2), everything else to the next day.
+_DAYS_TO_NEXT_WEEKDAY = (1, 1, 1, 1, 3, 2, 1)  # Mon..Sun
 
 
 def get_next_weekday() -> date:
     """Calculates the date of the next upcoming weekday."""
     today = date.today()
-    # If it's Friday (4), add 3 days to get to Monday.
-    if today.weekday() == 4:
-        return today + timedelta(days=3)
-    # If it's Saturday (5), add 2 days to get to Monday.
-    elif today.weekday() == 5:
-        return today + timedelta(days=2)
-    # Otherwise (Sunday-Thursday), just go to the next day.
-    else:
-        return today + timedelta(days=1)
+    return today + timedelta(days=_DAYS_TO_NEXT_WEEKDAY[today.weekday()])
 
 
 def format_duration(seconds: int, traffic_ok: bool) -> str:
@@ -33,6 +39,79 @@ def format_duration(seconds: int, traffic_ok: bool) -> str:
 
 # --- Core Logic ---
 
+# The departure window under analysis (6:00 AM to 10:00 AM).
+ANALYSIS_START_HOUR = 6
+ANALYSIS_END_HOUR = 10
+ANALYSIS_INCREMENT_MINUTES = 30
+
+
+def build_departure_grid(analysis_date: date) -> list:
+    """Builds the list of candidate departure datetimes for one analysis."""
+    naive_start_time = datetime(
+        analysis_date.year, analysis_date.month, analysis_date.day, ANALYSIS_START_HOUR)
+    first_departure = naive_start_time.replace(tzinfo=COMMUTE_TZ)
+    slot_count = (ANALYSIS_END_HOUR - ANALYSIS_START_HOUR) * \
+        60 // ANALYSIS_INCREMENT_MINUTES + 1
+    return [first_departure + timedelta(minutes=ANALYSIS_INCREMENT_MINUTES * i)
+            for i in range(slot_count)]
+
+
+# Pre-resolved coordinates for the default prompt addresses, shipped with
+# the repo so runs on the defaults skip the geocoding calls entirely.
+KNOWN_GEOCODES_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "default_addresses.json")
+
+
+def _load_known_geocodes() -> dict[str, Coordinates]:
+    try:
+        with open(KNOWN_GEOCODES_PATH) as f:
+            return {address: Coordinates(lat=lat, lon=lon)
+                    for address, (lat, lon) in json.load(f).items()}
+    except (OSError, ValueError):
+        return {}
+
+
+KNOWN_GEOCODES = _load_known_geocodes()
+
+
+def geocode_addresses(api_adapter: ApiAdapter, home_address: str, work_address: str):
+    """Geocodes the two addresses concurrently - they are independent
+    lookups, so there is no reason to pay the round trips back-to-back.
+    Addresses with a shipped entry in default_addresses.json are answered
+    locally without touching the API."""
+    def resolve(address: str):
+        return KNOWN_GEOCODES.get(address) or api_adapter.get_coordinates(address)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        home_coords, work_coords = executor.map(
+            resolve, (home_address, work_address))
+    return home_coords, work_coords
+
+
+def get_routes_cached(api_adapter: ApiAdapter, start_coords, end_coords, departure_times):
+    """
+    Answers each departure slot from the route cache when possible and only
+    sends the misses to the adapter, storing fresh results for next time.
+
+    The whole window is prefetched with one SELECT up front, so the cache
+    costs a single disk round trip regardless of how many slots hit.
+    """
+    known = COMMUTE_CACHE.prefetch(start_coords, end_coords, departure_times)
+    results = [known.get(dep_bucket(t)) for t in departure_times]
+
+    miss_indices = [i for i, info in enumerate(results) if info is None]
+    if miss_indices:
+        fetched = api_adapter.get_routes(
+            start_coords, end_coords, [departure_times[i] for i in miss_indices])
+        fresh = []
+        for i, route_info in zip(miss_indices, fetched):
+            results[i] = route_info
+            if route_info:
+                fresh.append((departure_times[i], route_info))
+        COMMUTE_CACHE.store(start_coords, end_coords, fresh)
+    return results
+
+
 def analyze_commute_scenarios(
     home_address: str,
     work_address: str,
@@ -42,120 +121,228 @@ def analyze_commute_scenarios(
 ):
     """
     Analyzes multiple departure times using the provided API adapter.
+
+    The route lookups are issued in two concurrent waves (all morning
+    trips, then all evening trips), so the wall time is bounded by the
+    slowest response in each wave rather than the sum of all of them.
+    Scenarios are yielded one at a time so the consumer can format each
+    record as it arrives instead of holding the whole list.
     """
     print("\nStarting commute analysis.")
 
-    home_coords = api_adapter.get_coordinates(home_address)
-    work_coords = api_adapter.get_coordinates(work_address)
+    home_coords, work_coords = geocode_addresses(
+        api_adapter, home_address, work_address)
     if not home_coords or not work_coords:
         print("\nCould not proceed without valid coordinates for both addresses.")
-        return []
-
-    # Define the time range for the analysis (6:00 AM to 10:00 AM).
-    scenarios = []
-    start_hour = 6
-    end_hour = 10
-    increment_minutes = 30
-    naive_start_time = datetime(
-        analysis_date.year, analysis_date.month, analysis_date.day, start_hour)
-    current_time = naive_start_time.replace(tzinfo=COMMUTE_TZ)
+        return
 
-    end_time = current_time.replace(hour=end_hour)
+    departure_times = build_departure_grid(analysis_date)
+    # Render each departure label once instead of per message below.
+    departure_strs = [t.strftime('%I:%M %p') for t in departure_times]
 
     print(
         f"\nAnalyzing departures for {analysis_date.strftime('%A, %B %d, %Y')}")
     print("This will take a few moments as we make multiple API calls...\n")
 
-    # Loop through each departure time and run the simulation.
-    while current_time <= end_time:
-        departure_str = current_time.strftime('%I:%M %p')
-        print(f"Analyzing departure at {departure_str}.")
-
-        time.sleep(0.5)  # A small delay to avoid hitting API rate limits.
-
-        morning_route_info = api_adapter.get_route(
-            home_coords, work_coords, current_time)
+    # Wave 1: every morning route at once.
+    print(f"Analyzing {len(departure_times)} morning departures.")
+    morning_infos = get_routes_cached(
+        api_adapter, home_coords, work_coords, departure_times)
+
+    # Work out the matching evening departures for the slots that resolved.
+    # The workday length is invariant, so build the offset once.
+    workday_offset = timedelta(hours=8, minutes=lunch_minutes)
+    morning_results = []
+    work_departure_times = []
+    for leave_home, departure_str, morning_route_info in zip(
+            departure_times, departure_strs, morning_infos):
         if not morning_route_info:
             print(
                 f"   ! Skipping {departure_str}: Could not calculate the morning route.")
-            current_time += timedelta(minutes=increment_minutes)
             continue
-
-        morning_travel_seconds = morning_route_info.travel_time_sec
-        work_arrival_time = current_time + \
-            timedelta(seconds=morning_travel_seconds)
-        work_departure_time = work_arrival_time + \
-            timedelta(hours=8, minutes=lunch_minutes)
-
-        evening_route_info = api_adapter.get_route(
-            work_coords, home_coords, work_departure_time)
+        work_arrival_time = leave_home + \
+            timedelta(seconds=morning_route_info.travel_time_sec)
+        work_departure_time = work_arrival_time + workday_offset
+        morning_results.append(
+            (leave_home, departure_str, morning_route_info, work_arrival_time, work_departure_time))
+        work_departure_times.append(work_departure_time)
+
+    # Wave 2: every evening route at once.
+    print(f"Analyzing {len(work_departure_times)} evening departures.")
+    evening_infos = get_routes_cached(
+        api_adapter, work_coords, home_coords, work_departure_times)
+
+    for (leave_home, departure_str, morning_route_info, work_arrival_time, work_departure_time), evening_route_info \
+            in zip(morning_results, evening_infos):
         if not evening_route_info:
             evening_departure_str = work_departure_time.strftime('%I:%M %p')
             print(
                 f"   ! Skipping {departure_str} departure: Could not calculate the evening route (leaving work at {evening_departure_str}).")
-            current_time += timedelta(minutes=increment_minutes)
             continue
 
+        morning_travel_seconds = morning_route_info.travel_time_sec
         evening_travel_seconds = evening_route_info.travel_time_sec
+        yield Scenario(
+            leave_home=leave_home,
+            morning_travel_sec=morning_travel_seconds,
+            morning_traffic_ok=morning_route_info.traffic_data_included,
+            arrive_work=work_arrival_time,
+            leave_work=work_departure_time,
+            evening_travel_sec=evening_travel_seconds,
+            evening_traffic_ok=evening_route_info.traffic_data_included,
+            total_commute_sec=morning_travel_seconds + evening_travel_seconds,
+        )
+
+
+def find_best_departure_adaptive(
+    home_address: str,
+    work_address: str,
+    analysis_date: date,
+    lunch_minutes: int,
+    api_adapter: ApiAdapter
+):
+    """
+    Finds the best departure time with a handful of probes instead of
+    sweeping every slot.
+
+    Total commute time over a morning window is close to unimodal, so a
+    bracketing search (probe the endpoints and midpoints, then narrow
+    around the best slot) reaches the minimum with O(log N) API calls.
+    Probed slots are memoized, and each probe produces a full scenario so
+    the results table shows exactly what was measured.
+    """
+    print("\nStarting commute analysis.")
 
-        scenarios.append({
-            'leave_home': current_time,
-            'morning_travel_sec': morning_travel_seconds,
-            'morning_traffic_ok': morning_route_info.traffic_data_included,
-            'arrive_work': work_arrival_time,
-            'leave_work': work_departure_time,
-            'evening_travel_sec': evening_travel_seconds,
-            'evening_traffic_ok': evening_route_info.traffic_data_included,
-            'total_commute_sec': morning_travel_seconds + evening_travel_seconds,
-        })
-
-        current_time += timedelta(minutes=increment_minutes)
-
-    return scenarios
+    home_coords, work_coords = geocode_addresses(
+        api_adapter, home_address, work_address)
+    if not home_coords or not work_coords:
+        print("\nCould not proceed without valid coordinates for both addresses.")
+        return []
 
+    grid = build_departure_grid(analysis_date)
+    workday_offset = timedelta(hours=8, minutes=lunch_minutes)
+    probed: dict[int, Scenario | None] = {}
 
-def display_results(scenarios: list, analysis_date: date):
-    """Formats and prints the results table and the final recommendation."""
-    if not scenarios:
+    print(
+        f"\nAnalyzing departures for {analysis_date.strftime('%A, %B %d, %Y')}")
+    print("Using adaptive search; only the promising departure slots are probed.\n")
+
+    def probe(i: int):
+        """Evaluates one grid slot (memoized), returning its scenario."""
+        if i in probed:
+            return probed[i]
+
+        leave_home = grid[i]
+        print(f"Probing departure at {leave_home.strftime('%I:%M %p')}.")
+        scenario = None
+        morning_route_info = get_routes_cached(
+            api_adapter, home_coords, work_coords, [leave_home])[0]
+        if morning_route_info:
+            work_arrival_time = leave_home + \
+                timedelta(seconds=morning_route_info.travel_time_sec)
+            work_departure_time = work_arrival_time + workday_offset
+            evening_route_info = get_routes_cached(
+                api_adapter, work_coords, home_coords, [work_departure_time])[0]
+            if evening_route_info:
+                morning_travel_seconds = morning_route_info.travel_time_sec
+                evening_travel_seconds = evening_route_info.travel_time_sec
+                scenario = Scenario(
+                    leave_home=leave_home,
+                    morning_travel_sec=morning_travel_seconds,
+                    morning_traffic_ok=morning_route_info.traffic_data_included,
+                    arrive_work=work_arrival_time,
+                    leave_work=work_departure_time,
+                    evening_travel_sec=evening_travel_seconds,
+                    evening_traffic_ok=evening_route_info.traffic_data_included,
+                    total_commute_sec=morning_travel_seconds + evening_travel_seconds,
+                )
+
+        if scenario is None:
+            print(
+                f"   ! Skipping {leave_home.strftime('%I:%M %p')}: Could not calculate a full round trip.")
+        probed[i] = scenario
+        return scenario
+
+    def total_of(i: int):
+        scenario = probe(i)
+        return scenario.total_commute_sec if scenario else float('inf')
+
+    # Bracket the minimum, then bisect the better half until the remaining
+    # interval is down to adjacent slots.
+    lo, hi = 0, len(grid) - 1
+    while hi - lo > 2:
+        mid = (lo + hi) // 2
+        candidates = sorted({lo, (lo + mid) // 2, mid, (mid + hi) // 2, hi})
+        best = min(candidates, key=total_of)
+        idx = candidates.index(best)
+        lo = candidates[max(0, idx - 1)]
+        hi = candidates[min(len(candidates) - 1, idx + 1)]
+
+    for i in range(lo, hi + 1):
+        probe(i)
+
+    return [scenario for _, scenario in sorted(probed.items()) if scenario]
+
+
+def display_results(scenarios, analysis_date: date):
+    """Formats and prints the results table and the final recommendation.
+
+    `scenarios` may be any iterable, including a lazy generator: each
+    record is formatted into its row string and compared against the
+    running best in a single streaming pass, so only the rendered strings
+    - never the full set of Scenario records - are held in memory.
+    """
+    rows = []
+    best_scenario = None
+    any_missing_traffic = False
+    for s in scenarios:
+        total_commute_traffic_ok = s.morning_traffic_ok and s.evening_traffic_ok
+        if not total_commute_traffic_ok:
+            any_missing_traffic = True
+        rows.append(
+            f"| {s.leave_home.strftime('%I:%M %p'):<10} | "
+            f"{format_duration(s.morning_travel_sec, s.morning_traffic_ok):<12} | "
+            f"{s.arrive_work.strftime('%I:%M %p'):<11} | "
+            f"{s.leave_work.strftime('%I:%M %p'):<10} | "
+            f"{format_duration(s.evening_travel_sec, s.evening_traffic_ok):<12} | "
+            f"**{format_duration(s.total_commute_sec, total_commute_traffic_ok):<11}** |")
+        if best_scenario is None or s.total_commute_sec < best_scenario.total_commute_sec:
+            best_scenario = s
+
+    if not rows:
         print("\nAnalysis could not be completed. No scenarios were generated.")
         return
 
-    print("\nHere are the commute analysis results.")
-    print(f"Scenarios for {analysis_date.strftime('%A, %B %d, %Y')}\n")
+    lines = ["", "Here are the commute analysis results.",
+             f"Scenarios for {analysis_date.strftime('%A, %B %d, %Y')}", ""]
 
-    # Check if any scenario is missing traffic data to decide if we need to print the footnote.
-    any_missing_traffic = any(
-        not s['morning_traffic_ok'] or not s['evening_traffic_ok'] for s in scenarios)
     if any_missing_traffic:
-        print("NOTE: An asterisk (*) indicates the travel time was calculated without live traffic data.\n")
+        lines.append(
+            "NOTE: An asterisk (*) indicates the travel time was calculated without live traffic data.")
+        lines.append("")
 
     header = "| Leave Home | Morning Trip | Arrive Work | Leave Work | Evening Trip | Total Commute |"
     divider = "-" * len(header)
-    print(header)
-    print(divider)
-
-    for s in scenarios:
-        total_commute_traffic_ok = s['morning_traffic_ok'] and s['evening_traffic_ok']
-        print(f"| {s['leave_home'].strftime('%I:%M %p'):<10} | "
-              f"{format_duration(s['morning_travel_sec'], s['morning_traffic_ok']):<12} | "
-              f"{s['arrive_work'].strftime('%I:%M %p'):<11} | "
-              f"{s['leave_work'].strftime('%I:%M %p'):<10} | "
-              f"{format_duration(s['evening_travel_sec'], s['evening_traffic_ok']):<12} | "
-              f"**{format_duration(s['total_commute_sec'], total_commute_traffic_ok):<11}** |")
-
-    print(divider)
+    lines.append(header)
+    lines.append(divider)
+    # The whole report is still emitted with a single write below rather
+    # than one print call (and flush) per line.
+    lines.extend(rows)
+    lines.append(divider)
 
-    best_scenario = min(scenarios, key=lambda x: x['total_commute_sec'])
-    best_leave_time = best_scenario['leave_home'].strftime('%I:%M %p')
+    best_leave_time = best_scenario.leave_home.strftime('%I:%M %p')
 
     # For the final recommendation, ensure the traffic flag is passed to the formatter
-    best_total_traffic_ok = best_scenario['morning_traffic_ok'] and best_scenario['evening_traffic_ok']
+    best_total_traffic_ok = best_scenario.morning_traffic_ok and best_scenario.evening_traffic_ok
     min_total_time = format_duration(
-        best_scenario['total_commute_sec'], best_total_traffic_ok)
+        best_scenario.total_commute_sec, best_total_traffic_ok)
 
-    print("\n✨ Best Option Found ✨")
-    print(f"To minimize your total time on the road ({min_total_time}), "
-          f"leave for work at {best_leave_time}.")
+    lines.append("")
+    lines.append("✨ Best Option Found ✨")
+    lines.append(f"To minimize your total time on the road ({min_total_time}), "
+                 f"leave for work at {best_leave_time}.")
+
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 if __name__ == '__main__':
@@ -165,8 +352,16 @@ if __name__ == '__main__':
         description="Daily Commute Optimizer: Find the best departure time.")
     parser.add_argument('-v', '--verbose', action='store_true',
                         help="Enable verbose mode to see the exact API calls being made.")
+    parser.add_argument('--exhaustive', action='store_true',
+                        help="Evaluate every 30-minute slot instead of using the adaptive search.")
     args = parser.parse_args()
 
+    # The adapters log their progress and errors; --verbose also shows the
+    # per-request API traces.
+    logging.basicConfig(
+        format="   > %(message)s",
+        level=logging.DEBUG if args.verbose else logging.WARNING)
+
     print("Welcome to the Daily Commute Optimizer.")
     print("This tool tests multiple departure times to find the one that")
     print("minimizes your total daily commute time (morning + evening).\n")
@@ -234,7 +429,11 @@ if __name__ == '__main__':
             print("Invalid input. Please enter a number.")
 
     commute_date = get_next_weekday()
-    all_scenarios = analyze_commute_scenarios(
-        home, work, commute_date, lunch, selected_api_adapter)
+    if args.exhaustive:
+        all_scenarios = analyze_commute_scenarios(
+            home, work, commute_date, lunch, selected_api_adapter)
+    else:
+        all_scenarios = find_best_departure_adaptive(
+            home, work, commute_date, lunch, selected_api_adapter)
 
     display_results(all_scenarios, commute_date)